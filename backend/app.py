@@ -1,15 +1,24 @@
 """
 Flask Web Application - ATS Resume Scorer API
 """
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+import multiprocessing
 import os
+import queue
 import sqlite3
 import sys
+import threading
 import uuid
 from datetime import datetime
 
 from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import FileTarget, ValueTarget
 from werkzeug.utils import secure_filename
 
 # Paths
@@ -17,9 +26,7 @@ BASE_DIR = Path(__file__).resolve().parent
 FRONTEND_DIR = BASE_DIR.parent / 'frontend'
 sys.path.insert(0, str(BASE_DIR))
 
-from resume_parser import ResumeParser
-from job_parser import JobDescriptionParser
-from ats_scorer import ATSScorer
+import worker
 
 app = Flask(
     __name__,
@@ -29,11 +36,42 @@ app = Flask(
 )
 CORS(app)
 
+
+def _orjson_default(obj):
+    """Serialize types orjson doesn't handle natively"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that uses orjson for jsonify() and request.get_json()"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip of the base implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_orjson_default), mimetype='application/json'
+        )
+
+
+app.json = OrjsonProvider(app)
+
 # Configuration
 UPLOAD_FOLDER = BASE_DIR / 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Uploads are streamed to disk in 1MB chunks
 DB_PATH = BASE_DIR / 'ats_scorer.db'
+# Each analysis process loads its own spaCy (and optional embedding) model, so the pool is
+# capped by default; set the ANALYSIS_WORKERS environment variable to override
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS') or min(os.cpu_count() or 1, 4))
 
 app.config['UPLOAD_FOLDER'] = str(UPLOAD_FOLDER)
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
@@ -41,10 +79,41 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 # Create uploads directory if it doesn't exist
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 
-# Initialize parsers and scorer
-resume_parser = ResumeParser()
-job_parser = JobDescriptionParser()
-scorer = ATSScorer()
+# Workers are started from a clean server process (forkserver, or spawn where forkserver
+# isn't available) rather than forked from this multi-threaded one, where another thread
+# could be holding a lock the child would inherit locked
+_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+
+def _new_executor():
+    """Create the analysis process pool"""
+    return ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, mp_context=_MP_CONTEXT)
+
+
+# Parsing and scoring are CPU-bound, so they run in worker processes
+# (each with its own parsers) and concurrent uploads use several cores
+executor = _new_executor()
+_executor_lock = threading.Lock()
+
+
+def run_analysis(resume_path, job_description):
+    """Score a resume in the worker pool, replacing the pool if a worker process died"""
+    global executor
+    pool = executor
+    try:
+        return pool.submit(worker.analyze, resume_path, job_description).result()
+    except BrokenProcessPool:
+        # A dead worker (e.g. OOM-killed on a huge PDF) breaks the whole pool, so start
+        # a new one; only the first request to notice replaces it
+        with _executor_lock:
+            if executor is pool:
+                executor = _new_executor()
+                pool.shutdown(wait=False)
+            pool = executor
+    # Retry once on the new pool (a file that crashes it again fails just this request)
+    return pool.submit(worker.analyze, resume_path, job_description).result()
 
 
 def allowed_file(filename):
@@ -52,9 +121,121 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def remove_upload(filepath):
+    """Delete an uploaded file, ignoring files that are already gone"""
+    try:
+        os.remove(filepath)
+    except OSError:
+        pass
+
+
+# Uploads are deleted by one background thread so the unlink stays off the response path
+_cleanup_queue = queue.Queue(maxsize=1024)
+
+
+def _cleanup_uploads():
+    """Delete queued uploads as they arrive"""
+    while True:
+        remove_upload(_cleanup_queue.get())
+
+
+threading.Thread(target=_cleanup_uploads, name='upload-cleanup', daemon=True).start()
+
+
+def schedule_upload_removal(filepath):
+    """Queue an uploaded file for deletion (deleting it right away if the queue is full)"""
+    try:
+        _cleanup_queue.put_nowait(filepath)
+    except queue.Full:
+        remove_upload(filepath)
+
+
+def stream_upload(upload_path):
+    """Stream the multipart request body to disk, returning (resume target, job description)"""
+    resume_target = FileTarget(upload_path)
+    job_target = ValueTarget()
+    
+    parser = StreamingFormDataParser(headers={'Content-Type': request.content_type})
+    parser.register('resume', resume_target)
+    parser.register('job_description', job_target)
+    
+    while True:
+        chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        parser.data_received(chunk)
+    
+    return resume_target, job_target.value.decode('utf-8', errors='replace')
+
+
+# One connection shared by every request thread (the threaded dev server starts a new
+# thread per request), so SQLite's page and statement caches stay warm. sqlite3
+# connections aren't safe for concurrent use, so hold _db_lock while using it.
+_db_conn = None
+_db_lock = threading.RLock()
+
+# SQL statements, kept as constants so each connection prepares them once and
+# reuses the compiled statement from sqlite3's per-connection statement cache
+_INSERT_SCORE_SQL = '''
+    INSERT INTO scores (id, filename, job_description, overall_score,
+                      skills_score, keywords_score, experience_score, education_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_INSERT_ANALYSIS_SQL = '''
+    INSERT INTO analysis (id, score_id, matched_skills, missing_skills, strengths, suggestions)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_HISTORY_SQL = '''
+    SELECT s.*, a.matched_skills, a.missing_skills, a.strengths, a.suggestions
+    FROM scores s
+    LEFT JOIN analysis a ON s.id = a.score_id
+    ORDER BY s.created_at DESC, s.id DESC
+    LIMIT ?
+'''
+# Keyset pagination: continue strictly after the (created_at, id) of the last row seen
+_HISTORY_BEFORE_SQL = '''
+    SELECT s.*, a.matched_skills, a.missing_skills, a.strengths, a.suggestions
+    FROM scores s
+    LEFT JOIN analysis a ON s.id = a.score_id
+    WHERE (s.created_at, s.id) < (?, ?)
+    ORDER BY s.created_at DESC, s.id DESC
+    LIMIT ?
+'''
+_SCORE_SQL = '''
+    SELECT s.*, a.matched_skills, a.missing_skills, a.strengths, a.suggestions
+    FROM scores s
+    LEFT JOIN analysis a ON s.id = a.score_id
+    WHERE s.id = ?
+'''
+
+
+def get_db_connection():
+    """Return the shared database connection, opening it on first use (callers hold _db_lock)"""
+    global _db_conn
+    with _db_lock:
+        if _db_conn is None:
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # With WAL, NORMAL only syncs at checkpoints instead of on every commit
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-65536')  # 64MB page cache
+            # Set up the schema whenever a process first connects, so it exists however
+            # the app is served (python app.py or a WSGI server importing app:app)
+            _create_schema(conn)
+            _db_conn = conn
+        return _db_conn
+
+
 def init_db():
     """Initialize database"""
-    conn = sqlite3.connect(DB_PATH)
+    get_db_connection()
+
+
+def _create_schema(conn):
+    """Create the tables and indexes if missing"""
+    # WAL is persistent: readers no longer block the writer and vice versa
+    conn.execute('PRAGMA journal_mode=WAL')
     c = conn.cursor()
     
     # Create scores table
@@ -85,8 +266,13 @@ def init_db():
         )
     ''')
     
+    # Let history read (and page through) newest rows straight off an index instead of
+    # sorting the table, and join each score to its analysis without scanning the analysis table
+    c.execute('DROP INDEX IF EXISTS idx_scores_created')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_scores_created_id ON scores(created_at DESC, id DESC)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_analysis_score_id ON analysis(score_id)')
+    
     conn.commit()
-    conn.close()
 
 
 @app.route('/')
@@ -99,75 +285,65 @@ def index():
 def analyze_resume():
     """API endpoint to analyze resume against job description"""
     try:
-        # Check if resume file is present
-        if 'resume' not in request.files:
+        if request.mimetype != 'multipart/form-data':
             return jsonify({'error': 'No resume file provided'}), 400
         
-        file = request.files['resume']
-        job_description = request.form.get('job_description', '')
-        
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+        # Stream the upload straight to disk instead of letting Werkzeug
+        # buffer it first and then copying it again
+        upload_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}.part")
+        try:
+            resume_target, job_description = stream_upload(upload_path)
+        except Exception:
+            remove_upload(upload_path)
+            raise
         
-        if not job_description.strip():
-            return jsonify({'error': 'Job description is required'}), 400
+        # Check if resume file is present
+        error = None
+        if resume_target.multipart_filename is None:
+            error = 'No resume file provided'
+        elif resume_target.multipart_filename == '':
+            error = 'No file selected'
+        elif not job_description.strip():
+            error = 'Job description is required'
+        elif not allowed_file(resume_target.multipart_filename):
+            error = 'Invalid file type. Please upload PDF or DOCX'
         
-        if not allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type. Please upload PDF or DOCX'}), 400
+        if error:
+            schedule_upload_removal(upload_path)
+            return jsonify({'error': error}), 400
         
-        # Save uploaded file
-        filename = secure_filename(file.filename)
+        # Name the saved upload after the original file (parsers go by its extension)
+        filename = secure_filename(resume_target.multipart_filename)
         unique_filename = f"{uuid.uuid4()}_{filename}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(filepath)
+        os.replace(upload_path, filepath)
         
         try:
-            # Parse resume
-            resume_data = resume_parser.parse(filepath)
-            
-            # Parse job description
-            job_data = job_parser.extract_requirements(job_description)
-            
-            # Calculate score
-            score_results = scorer.calculate_score(resume_data, job_data)
+            # Parse resume and job description, then calculate score
+            score_results = run_analysis(filepath, job_description)
             
             # Save to database
             score_id = str(uuid.uuid4())
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            
-            # Insert score
-            c.execute('''
-                INSERT INTO scores (id, filename, job_description, overall_score, 
-                                  skills_score, keywords_score, experience_score, education_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                score_id, filename, job_description[:500], score_results['overall_score'],
-                score_results['skills_score'], score_results['keywords_score'],
-                score_results['experience_score'], score_results['education_score']
-            ))
-            
-            # Insert analysis
-            import json
-            c.execute('''
-                INSERT INTO analysis (id, score_id, matched_skills, missing_skills, strengths, suggestions)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                str(uuid.uuid4()), score_id,
-                json.dumps(list(score_results['matched_skills'])),
-                json.dumps(score_results['missing_skills']),
-                json.dumps(score_results['strengths']),
-                json.dumps(score_results['suggestions'])
-            ))
-            
-            conn.commit()
-            conn.close()
+            # Both inserts share a single transaction (one commit)
+            with _db_lock, get_db_connection() as conn:
+                # Insert score
+                conn.execute(_INSERT_SCORE_SQL, (
+                    score_id, filename, job_description[:500], score_results['overall_score'],
+                    score_results['skills_score'], score_results['keywords_score'],
+                    score_results['experience_score'], score_results['education_score']
+                ))
+
+                # Insert analysis
+                conn.execute(_INSERT_ANALYSIS_SQL, (
+                    str(uuid.uuid4()), score_id,
+                    orjson.dumps(list(score_results['matched_skills'])).decode(),
+                    orjson.dumps(score_results['missing_skills']).decode(),
+                    orjson.dumps(score_results['strengths']).decode(),
+                    orjson.dumps(score_results['suggestions']).decode()
+                ))
             
             # Clean up uploaded file
-            try:
-                os.remove(filepath)
-            except:
-                pass
+            schedule_upload_removal(filepath)
             
             return jsonify({
                 'success': True,
@@ -177,10 +353,7 @@ def analyze_resume():
             
         except Exception as e:
             # Clean up on error
-            try:
-                os.remove(filepath)
-            except:
-                pass
+            schedule_upload_removal(filepath)
             return jsonify({'error': f'Error processing file: {str(e)}'}), 500
             
     except Exception as e:
@@ -191,24 +364,20 @@ def analyze_resume():
 def get_history():
     """API endpoint to get analysis history"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
-        
         limit = request.args.get('limit', 10, type=int)
+        before = request.args.get('before')
         
-        c.execute('''
-            SELECT s.*, a.matched_skills, a.missing_skills, a.strengths, a.suggestions
-            FROM scores s
-            LEFT JOIN analysis a ON s.id = a.score_id
-            ORDER BY s.created_at DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        rows = c.fetchall()
-        conn.close()
+        with _db_lock:
+            c = get_db_connection().cursor()
+            if before:
+                # Without before_id every row at exactly `before` is skipped (no id sorts below '')
+                before_id = request.args.get('before_id', '')
+                c.execute(_HISTORY_BEFORE_SQL, (before, before_id, limit))
+            else:
+                c.execute(_HISTORY_SQL, (limit,))
+            
+            rows = c.fetchall()
         
-        import json
         history = []
         for row in rows:
             history.append({
@@ -216,8 +385,8 @@ def get_history():
                 'filename': row['filename'],
                 'overall_score': row['overall_score'],
                 'created_at': row['created_at'],
-                'matched_skills': json.loads(row['matched_skills']) if row['matched_skills'] else [],
-                'missing_skills': json.loads(row['missing_skills']) if row['missing_skills'] else []
+                'matched_skills': orjson.loads(row['matched_skills']) if row['matched_skills'] else [],
+                'missing_skills': orjson.loads(row['missing_skills']) if row['missing_skills'] else []
             })
         
         return jsonify({'success': True, 'history': history})
@@ -230,24 +399,14 @@ def get_history():
 def get_score(score_id):
     """API endpoint to get specific score details"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
-        
-        c.execute('''
-            SELECT s.*, a.matched_skills, a.missing_skills, a.strengths, a.suggestions
-            FROM scores s
-            LEFT JOIN analysis a ON s.id = a.score_id
-            WHERE s.id = ?
-        ''', (score_id,))
-        
-        row = c.fetchone()
-        conn.close()
+        with _db_lock:
+            c = get_db_connection().cursor()
+            c.execute(_SCORE_SQL, (score_id,))
+            row = c.fetchone()
         
         if not row:
             return jsonify({'error': 'Score not found'}), 404
         
-        import json
         result = {
             'id': row['id'],
             'filename': row['filename'],
@@ -257,10 +416,10 @@ def get_score(score_id):
             'experience_score': row['experience_score'],
             'education_score': row['education_score'],
             'created_at': row['created_at'],
-            'matched_skills': json.loads(row['matched_skills']) if row['matched_skills'] else [],
-            'missing_skills': json.loads(row['missing_skills']) if row['missing_skills'] else [],
-            'strengths': json.loads(row['strengths']) if row['strengths'] else [],
-            'suggestions': json.loads(row['suggestions']) if row['suggestions'] else []
+            'matched_skills': orjson.loads(row['matched_skills']) if row['matched_skills'] else [],
+            'missing_skills': orjson.loads(row['missing_skills']) if row['missing_skills'] else [],
+            'strengths': orjson.loads(row['strengths']) if row['strengths'] else [],
+            'suggestions': orjson.loads(row['suggestions']) if row['suggestions'] else []
         }
         
         return jsonify({'success': True, 'result': result})
@@ -1,11 +1,39 @@
 """
 ATS Scorer - Compares resume with job description and generates scores
 """
-from typing import Dict, List, Set, Tuple
-from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 import re
 
-from ml_model import compute_semantic_similarity
+from ml_model import compute_semantic_similarity, match_skills_semantically
+
+# Try to import rapidfuzz, but make it optional
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    fuzz = process = None
+
+_YEAR_RE = re.compile(r'(\d{4})')
+
+# Weights of the component scores in the overall score
+_SKILLS_WEIGHT = 0.35  # Skills are most important (35%)
+_KEYWORDS_WEIGHT = 0.20  # Keywords (20%)
+_EXPERIENCE_WEIGHT = 0.15  # Experience (15%)
+_EDUCATION_WEIGHT = 0.10  # Education (10%)
+_SEMANTIC_WEIGHT = 0.20  # ML semantic similarity (20%)
+
+
+def _shingles(text: str) -> FrozenSet[int]:
+    """Return the hashed character 3-grams of text (the whole text if it's shorter)"""
+    if len(text) < 3:
+        return frozenset((hash(text) & 0xffffffff,))
+    return frozenset(hash(text[i:i + 3]) & 0xffffffff for i in range(len(text) - 2))
+
+
+def _normalize(items: Set[str]) -> FrozenSet[str]:
+    """Lowercase and strip a set of skills/keywords for comparison"""
+    return frozenset(item.lower().strip() for item in items)
 
 
 class ATSScorer:
@@ -17,14 +45,19 @@ class ATSScorer:
         """Calculate overall ATS score and generate analysis"""
         
         # Calculate individual component scores
+        # (parsers also provide lowercase copies so the scorer doesn't re-normalize them)
         skills_score, skills_match, missing_skills = self._score_skills(
             resume_data.get('skills', set()),
-            job_data.get('skills', set())
+            job_data.get('skills', set()),
+            resume_data.get('skills_lower'),
+            job_data.get('skills_lower')
         )
         
         keywords_score, matched_keywords = self._score_keywords(
             resume_data.get('keywords', set()),
-            job_data.get('keywords', set())
+            job_data.get('keywords', set()),
+            resume_data.get('keywords_lower'),
+            job_data.get('keywords_lower')
         )
         
         experience_score = self._score_experience(
@@ -44,11 +77,11 @@ class ATSScorer:
         
         # Calculate weighted overall score (now includes ML semantic similarity)
         overall_score = (
-            skills_score * 0.35 +   # Skills are most important (35%)
-            keywords_score * 0.20 +  # Keywords (20%)
-            experience_score * 0.15 +  # Experience (15%)
-            education_score * 0.10 +   # Education (10%)
-            semantic_score * 0.20    # ML semantic similarity (20%)
+            skills_score * _SKILLS_WEIGHT +
+            keywords_score * _KEYWORDS_WEIGHT +
+            experience_score * _EXPERIENCE_WEIGHT +
+            education_score * _EDUCATION_WEIGHT +
+            semantic_score * _SEMANTIC_WEIGHT
         )
         
         # Generate strengths
@@ -74,28 +107,28 @@ class ATSScorer:
             'suggestions': suggestions
         }
     
-    def _score_skills(self, resume_skills: Set[str], job_skills: Set[str]) -> Tuple[float, Set[str], Set[str]]:
+    def _score_skills(self, resume_skills: Set[str], job_skills: Set[str],
+                      resume_skills_lower: Optional[FrozenSet[str]] = None,
+                      job_skills_lower: Optional[FrozenSet[str]] = None) -> Tuple[float, Set[str], Set[str]]:
         """Score skills match (0-100)"""
         if not job_skills:
             return 100.0, set(), set()
         
-        # Normalize skills to lowercase for comparison
-        resume_skills_lower = {s.lower().strip() for s in resume_skills}
-        job_skills_lower = {s.lower().strip() for s in job_skills}
+        # Normalize skills to lowercase for comparison (unless the parser already did)
+        if resume_skills_lower is None:
+            resume_skills_lower = _normalize(resume_skills)
+        if job_skills_lower is None:
+            job_skills_lower = _normalize(job_skills)
         
         # Find exact matches
-        exact_matches = resume_skills_lower & job_skills_lower
+        exact_matches = job_skills_lower & resume_skills_lower
         
         # Find fuzzy matches (similar skills)
-        fuzzy_matches = set()
         remaining_job_skills = job_skills_lower - exact_matches
+        fuzzy_matches = self._fuzzy_match_skills(remaining_job_skills, resume_skills_lower)
         
-        for job_skill in remaining_job_skills:
-            for resume_skill in resume_skills_lower:
-                similarity = SequenceMatcher(None, job_skill, resume_skill).ratio()
-                if similarity > 0.8:  # 80% similarity threshold
-                    fuzzy_matches.add(job_skill)
-                    break
+        # Find semantic matches (same skill, different spelling) via sentence embeddings
+        fuzzy_matches |= match_skills_semantically(remaining_job_skills - fuzzy_matches, resume_skills_lower)
         
         # Find original case matched skills for display
         matched_skills = set()
@@ -112,17 +145,48 @@ class ATSScorer:
         
         return score, matched_skills, missing_skills
     
-    def _score_keywords(self, resume_keywords: Set[str], job_keywords: Set[str]) -> Tuple[float, Set[str]]:
+    def _fuzzy_match_skills(self, job_skills: Set[str], resume_skills: Set[str]) -> Set[str]:
+        """Return the job skills that are over 80% similar to some resume skill"""
+        if not job_skills or not resume_skills:
+            return set()
+        
+        job_list = list(job_skills)
+        if RAPIDFUZZ_AVAILABLE:
+            # One vectorized pass over the whole job x resume similarity matrix (single
+            # thread: the matrix is small and requests already run in parallel processes)
+            scores = process.cdist(
+                job_list, list(resume_skills),
+                scorer=fuzz.ratio, score_cutoff=80
+            )
+            return {job_skill for job_skill, row in zip(job_list, scores) if row.max() > 80}
+        
+        # Fallback: Jaccard similarity of character 3-gram shingles
+        resume_shingles = [_shingles(resume_skill) for resume_skill in resume_skills]
+        fuzzy_matches = set()
+        for job_skill in job_list:
+            job_shingles = _shingles(job_skill)
+            for shingles in resume_shingles:
+                similarity = len(job_shingles & shingles) / len(job_shingles | shingles)
+                if similarity > 0.8:  # 80% similarity threshold
+                    fuzzy_matches.add(job_skill)
+                    break
+        return fuzzy_matches
+    
+    def _score_keywords(self, resume_keywords: Set[str], job_keywords: Set[str],
+                        resume_keywords_lower: Optional[FrozenSet[str]] = None,
+                        job_keywords_lower: Optional[FrozenSet[str]] = None) -> Tuple[float, Set[str]]:
         """Score keyword match (0-100)"""
         if not job_keywords:
             return 100.0, set()
         
-        # Normalize keywords
-        resume_keywords_lower = {k.lower().strip() for k in resume_keywords}
-        job_keywords_lower = {k.lower().strip() for k in job_keywords}
+        # Normalize keywords (unless the parser already did)
+        if resume_keywords_lower is None:
+            resume_keywords_lower = _normalize(resume_keywords)
+        if job_keywords_lower is None:
+            job_keywords_lower = _normalize(job_keywords)
         
         # Find matches
-        matches = resume_keywords_lower & job_keywords_lower
+        matches = job_keywords_lower & resume_keywords_lower
         
         # Find original case matched keywords
         matched_keywords = set()
@@ -140,20 +204,15 @@ class ATSScorer:
         if required_years == 0:
             return 100.0
         
-        # Extract years from experience entries
+        # Extract years from experience entries (only the first two years matter)
         total_years = 0
-        date_pattern = r'(\d{4})'
         
         for exp in resume_experience:
-            dates = exp.get('dates', '')
-            years = re.findall(date_pattern, dates)
-            if len(years) >= 2:
-                try:
-                    start_year = int(years[0])
-                    end_year = int(years[1]) if years[1] else 2024
-                    total_years += (end_year - start_year)
-                except ValueError:
-                    pass
+            years = _YEAR_RE.finditer(exp.get('dates', ''))
+            start_year = next(years, None)
+            end_year = next(years, None)
+            if end_year is not None:
+                total_years += int(end_year.group(1)) - int(start_year.group(1))
         
         # If we can't extract years, assume they have some experience
         if total_years == 0 and resume_experience:
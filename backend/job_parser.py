@@ -4,16 +4,55 @@ Job Description Parser - Extracts requirements and skills from job descriptions
 import re
 from typing import Dict, List, Set
 
+from skill_matcher import SkillMatcher
+
+# Common skills database
+_COMMON_SKILLS = [
+    'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'swift', 'kotlin',
+    'typescript', 'php', 'r', 'matlab', 'scala', 'perl', 'rust',
+    'html', 'css', 'react', 'angular', 'vue.js', 'node.js', 'express', 'django',
+    'flask', 'spring', 'asp.net', 'jquery', 'bootstrap', 'sass', 'less',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'sqlite', 'redis',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'ci/cd',
+    'git', 'github', 'gitlab', 'terraform', 'ansible', 'chef', 'puppet',
+    'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'keras',
+    'pandas', 'numpy', 'scikit-learn', 'data analysis', 'statistics',
+    'linux', 'unix', 'windows', 'agile', 'scrum', 'jira', 'confluence'
+]
+
+# Precompiled patterns (compiled once at import instead of on every request)
+_SKILLS_SECTION_PATTERNS = [
+    re.compile(r'(?:required skills?|technical skills?|skills required|qualifications?)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
+               re.IGNORECASE | re.MULTILINE),
+    re.compile(r'(?:must have|required)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)', re.IGNORECASE | re.MULTILINE),
+]
+_CAPITALIZED_TERM_RE = re.compile(r'\b[A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)*\b')
+_EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)', re.IGNORECASE),
+    re.compile(r'minimum\s*(?:of\s*)?(\d+)\s*years?', re.IGNORECASE),
+    re.compile(r'at least\s*(\d+)\s*years?', re.IGNORECASE),
+]
+_DEGREE_RE = re.compile(
+    r'\b(Bachelor|Master|PhD|Doctorate|B\.S\.|B\.A\.|M\.S\.|M\.A\.|Ph\.D\.|BS|BA|MS|MA)\s+(?:degree|of|in)?\s*\w*',
+    re.IGNORECASE
+)
+_RESPONSIBILITY_PATTERNS = [
+    re.compile(r'(?:responsibilities|key responsibilities|duties?|what you\'ll do)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
+               re.IGNORECASE | re.MULTILINE),
+]
+_QUALIFICATION_PATTERNS = [
+    re.compile(r'(?:qualifications?|requirements?|must have)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
+               re.IGNORECASE | re.MULTILINE),
+]
+
 
 class JobDescriptionParser:
     def __init__(self):
         """Initialize the job description parser"""
-        pass
+        self._skill_matcher = SkillMatcher(_COMMON_SKILLS)
     
     def extract_requirements(self, job_description: str) -> Dict:
         """Extract requirements from job description"""
-        text_lower = job_description.lower()
-        
         # Extract required skills
         skills = self._extract_skills(job_description)
         
@@ -29,52 +68,34 @@ class JobDescriptionParser:
         # Extract qualifications
         qualifications = self._extract_qualifications(job_description)
         
+        keywords = self._extract_keywords(job_description)
+        
         return {
             'skills': skills,
+            'skills_lower': frozenset(s.lower().strip() for s in skills),
             'experience_years': experience_years,
             'education': education,
             'responsibilities': responsibilities,
             'qualifications': qualifications,
-            'keywords': self._extract_keywords(job_description),
+            'keywords': keywords,
+            'keywords_lower': frozenset(k.lower().strip() for k in keywords),
             'full_text': job_description
         }
     
     def _extract_skills(self, text: str) -> Set[str]:
         """Extract required skills from job description"""
         skills = set()
-        text_lower = text.lower()
-        
-        # Common skills database
-        common_skills = [
-            'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'swift', 'kotlin',
-            'typescript', 'php', 'r', 'matlab', 'scala', 'perl', 'rust',
-            'html', 'css', 'react', 'angular', 'vue.js', 'node.js', 'express', 'django',
-            'flask', 'spring', 'asp.net', 'jquery', 'bootstrap', 'sass', 'less',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'sqlite', 'redis',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'ci/cd',
-            'git', 'github', 'gitlab', 'terraform', 'ansible', 'chef', 'puppet',
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'keras',
-            'pandas', 'numpy', 'scikit-learn', 'data analysis', 'statistics',
-            'linux', 'unix', 'windows', 'agile', 'scrum', 'jira', 'confluence'
-        ]
         
         # Check for each skill in the text
-        for skill in common_skills:
-            if skill in text_lower:
-                skills.add(skill.title())
+        skills.update(skill.title() for skill in self._skill_matcher.find(text))
         
         # Look for skills section
-        skills_patterns = [
-            r'(?:required skills?|technical skills?|skills required|qualifications?)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
-            r'(?:must have|required)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
-        ]
-        
-        for pattern in skills_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
+        for pattern in _SKILLS_SECTION_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 skills_text = match.group(1)
                 # Extract capitalized terms (likely technologies)
-                capitalized_terms = re.findall(r'\b[A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)*\b', skills_text)
+                capitalized_terms = _CAPITALIZED_TERM_RE.findall(skills_text)
                 skills.update([term for term in capitalized_terms if len(term) > 2])
                 
                 # Also check for common skill patterns
@@ -88,14 +109,8 @@ class JobDescriptionParser:
     
     def _extract_experience_years(self, text: str) -> int:
         """Extract required years of experience"""
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)',
-            r'minimum\s*(?:of\s*)?(\d+)\s*years?',
-            r'at least\s*(\d+)\s*years?'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _EXPERIENCE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return int(match.group(1))
         
@@ -105,9 +120,7 @@ class JobDescriptionParser:
         """Extract education requirements"""
         education = []
         
-        degree_pattern = r'\b(Bachelor|Master|PhD|Doctorate|B\.S\.|B\.A\.|M\.S\.|M\.A\.|Ph\.D\.|BS|BA|MS|MA)\s+(?:degree|of|in)?\s*\w*'
-        
-        matches = re.finditer(degree_pattern, text, re.IGNORECASE)
+        matches = _DEGREE_RE.finditer(text)
         for match in matches:
             education.append(match.group(0))
         
@@ -118,12 +131,8 @@ class JobDescriptionParser:
         responsibilities = []
         
         # Look for responsibilities section
-        responsibility_patterns = [
-            r'(?:responsibilities|key responsibilities|duties?|what you\'ll do)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
-        ]
-        
-        for pattern in responsibility_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        for pattern in _RESPONSIBILITY_PATTERNS:
+            match = pattern.search(text)
             if match:
                 responsibilities_text = match.group(1)
                 # Split by bullet points or new lines
@@ -138,12 +147,8 @@ class JobDescriptionParser:
         """Extract qualifications"""
         qualifications = []
         
-        qualification_patterns = [
-            r'(?:qualifications?|requirements?|must have)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
-        ]
-        
-        for pattern in qualification_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        for pattern in _QUALIFICATION_PATTERNS:
+            match = pattern.search(text)
             if match:
                 qualifications_text = match.group(1)
                 for line in qualifications_text.split('\n'):
@@ -156,7 +161,7 @@ class JobDescriptionParser:
     def _extract_keywords(self, text: str) -> Set[str]:
         """Extract important keywords"""
         # Extract capitalized terms (likely technologies, companies, etc.)
-        keywords = set(re.findall(r'\b[A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)*\b', text))
+        keywords = set(_CAPITALIZED_TERM_RE.findall(text))
         
         # Filter out common words
         common_words = {'The', 'A', 'An', 'This', 'That', 'We', 'You', 'Your', 'Our'}
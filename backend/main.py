@@ -2,7 +2,11 @@
 Main Application - ATS Resume Scorer
 Run this script to analyze a resume against a job description
 """
+import hashlib
+import importlib.util
+import io
 import os
+import pickle
 import sys
 from pathlib import Path
 
@@ -10,65 +14,112 @@ BASE_DIR = Path(__file__).resolve().parent
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from resume_parser import ResumeParser
-from job_parser import JobDescriptionParser
-from ats_scorer import ATSScorer
+# Parsed resumes are cached by file content, so re-scoring the same resume skips parsing
+CACHE_DIR = Path.home() / '.cache' / 'ats'
+# Bump when the parser output changes so older cache entries are ignored
+PARSE_CACHE_VERSION = 1
+# Optional libraries that change the parsed output (spaCy keywords vs the fallback,
+# PDFium vs pdfplumber text), so results parsed with and without them are cached apart
+_PARSE_MODE_MODULES = ('spacy', 'en_core_web_sm', 'pypdfium2')
+
+
+def _parse_mode() -> str:
+    """Return which of the output-changing optional libraries are installed (without importing them)"""
+    return ','.join(name for name in _PARSE_MODE_MODULES if importlib.util.find_spec(name) is not None)
+
+
+def parse_resume(resume_path: str) -> dict:
+    """Parse a resume, reusing the cached result if this exact file was parsed before"""
+    with open(resume_path, 'rb') as f:
+        content = f.read()
+    
+    # The extension picks the parser and the installed libraries pick how it parses,
+    # so both are part of the key along with the content
+    key_prefix = f"{PARSE_CACHE_VERSION}:{_parse_mode()}:{Path(resume_path).suffix.lower()}:"
+    key = hashlib.sha1(key_prefix.encode() + content).hexdigest()
+    cache_path = CACHE_DIR / f"{key}.pkl"
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass  # not cached yet (or unreadable), parse below
+    
+    from resume_parser import ResumeParser
+    resume_data = ResumeParser().parse(resume_path)
+    
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(resume_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # caching is best-effort
+    
+    return resume_data
 
 
 def print_report(score_results: dict):
     """Print a formatted report of the ATS score analysis"""
-    print("\n" + "="*70)
-    print(" " * 20 + "ATS RESUME SCORE REPORT")
-    print("="*70 + "\n")
+    # Build the whole report in memory and write it to stdout once
+    out = io.StringIO()
+    
+    print("\n" + "="*70, file=out)
+    print(" " * 20 + "ATS RESUME SCORE REPORT", file=out)
+    print("="*70 + "\n", file=out)
     
     # Overall Score
     overall = score_results['overall_score']
-    score_bar = "█" * int(overall / 2) + "░" * (50 - int(overall / 2))
-    print(f"OVERALL SCORE: {overall}/100")
-    print(f"[{score_bar}]")
-    print()
+    filled = int(overall / 2)
+    score_bar = "█" * filled + "░" * (50 - filled)
+    print(f"OVERALL SCORE: {overall}/100", file=out)
+    print(f"[{score_bar}]", file=out)
+    print(file=out)
     
     # Component Scores
-    print("Component Scores:")
-    print(f"  • Skills Match:        {score_results['skills_score']:.1f}/100")
-    print(f"  • Keywords Match:      {score_results['keywords_score']:.1f}/100")
-    print(f"  • Experience Match:    {score_results['experience_score']:.1f}/100")
-    print(f"  • Education Match:     {score_results['education_score']:.1f}/100")
-    print()
+    print("Component Scores:", file=out)
+    print(f"  • Skills Match:        {score_results['skills_score']:.1f}/100", file=out)
+    print(f"  • Keywords Match:      {score_results['keywords_score']:.1f}/100", file=out)
+    print(f"  • Experience Match:    {score_results['experience_score']:.1f}/100", file=out)
+    print(f"  • Education Match:     {score_results['education_score']:.1f}/100", file=out)
+    print(file=out)
     
     # Matched Skills
     if score_results['matched_skills']:
-        print("✓ MATCHED SKILLS:")
+        print("✓ MATCHED SKILLS:", file=out)
         matched_list = list(score_results['matched_skills'])[:10]
         for skill in matched_list:
-            print(f"  • {skill}")
+            print(f"  • {skill}", file=out)
         if len(score_results['matched_skills']) > 10:
-            print(f"  ... and {len(score_results['matched_skills']) - 10} more")
-        print()
+            print(f"  ... and {len(score_results['matched_skills']) - 10} more", file=out)
+        print(file=out)
     
     # Missing Skills
     if score_results['missing_skills']:
-        print("✗ MISSING SKILLS:")
+        print("✗ MISSING SKILLS:", file=out)
         missing_list = list(score_results['missing_skills'])[:10]
         for skill in missing_list:
-            print(f"  • {skill}")
+            print(f"  • {skill}", file=out)
         if len(score_results['missing_skills']) > 10:
-            print(f"  ... and {len(score_results['missing_skills']) - 10} more")
-        print()
+            print(f"  ... and {len(score_results['missing_skills']) - 10} more", file=out)
+        print(file=out)
     
     # Strengths
-    print("STRENGTHS:")
+    print("STRENGTHS:", file=out)
     for strength in score_results['strengths']:
-        print(f"  ✓ {strength}")
-    print()
+        print(f"  ✓ {strength}", file=out)
+    print(file=out)
     
     # Suggestions
-    print("IMPROVEMENT SUGGESTIONS:")
+    print("IMPROVEMENT SUGGESTIONS:", file=out)
     for i, suggestion in enumerate(score_results['suggestions'], 1):
-        print(f"  {i}. {suggestion}")
-    print()
+        print(f"  {i}. {suggestion}", file=out)
+    print(file=out)
     
-    print("="*70 + "\n")
+    print("="*70 + "\n", file=out)
+    
+    sys.stdout.write(out.getvalue())
 
 
 def main():
@@ -113,11 +164,14 @@ def main():
         print("Error: Job description cannot be empty")
         return
     
+    # Imported only once the inputs are valid, so bad arguments fail fast
+    from job_parser import JobDescriptionParser
+    from ats_scorer import ATSScorer
+    
     # Parse resume
     print("\n📄 Parsing resume...")
     try:
-        resume_parser = ResumeParser()
-        resume_data = resume_parser.parse(resume_path)
+        resume_data = parse_resume(resume_path)
         print(f"✓ Resume parsed successfully!")
         print(f"  Found {len(resume_data['skills'])} skills")
         print(f"  Found {len(resume_data['experience'])} experience entries")
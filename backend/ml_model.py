@@ -1,20 +1,127 @@
 """
 Machine Learning utilities for semantic similarity between resume and job description.
-Uses TF-IDF vectorization and cosine similarity.
+Uses TF-IDF vectorization and cosine similarity, plus optional sentence embeddings
+for matching skills that are spelled differently (e.g. "PyTorch" vs "torch").
 """
-from typing import Union
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Set, Union
+import functools
+import hashlib
+import re
 
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+# scikit-learn, joblib and the optional sentence-transformers/torch are imported on
+# first use, so importing this module (e.g. for the CLI) stays fast
+if TYPE_CHECKING:
+    import torch
+
+
+class _LRUCache:
+    """Small thread-safe LRU cache"""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value) -> None:
+        """Cache value under key, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._data.clear()
+
+
+# Similarity scores keyed on (resume digest, job digest). The same job description
+# is usually scored against many resumes, so repeated pairs skip vectorizing
+# entirely. Digests keep the cache from pinning full texts.
+_similarity_cache = _LRUCache(1024)
+
+# Texts with fewer words than this are compared by word-set overlap (Jaccard):
+# vectorizing them costs more than it's worth and gives no better signal
+_SHORT_TEXT_WORDS = 20
+_WORD_RE = re.compile(r"\w+")
+
+# Analyzed TF-IDF terms keyed on text digest: each text is tokenized once, so a job
+# description scored against many resumes isn't re-tokenized for every resume
+_terms_cache = _LRUCache(256)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_analyzer():
+    """Return the TF-IDF analyzer (unigrams + bigrams, no stop words)"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(stop_words="english", ngram_range=(1, 2)).build_analyzer()
+
+
+def _pre_analyzed(terms: List[str]) -> List[str]:
+    """Analyzer for documents that are already lists of terms"""
+    return terms
+
+
+# TF-IDF fitted once on a background corpus of resumes and job descriptions, so
+# similarity only transforms each pair and the IDF weights are meaningful (fitting
+# on a single pair gives every shared term the same IDF). Loaded lazily from
+# TFIDF_VECTORIZER_PATH; without it each pair is compared by hashed term frequencies.
+TFIDF_VECTORIZER_PATH = Path(__file__).resolve().parent / "tfidf_vectorizer.joblib"
+_background_vectorizer = None
+_background_vectorizer_loaded = False
+_background_vectorizer_lock = Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_hasher():
+    """
+    Return the vectorizer for a single pair: term frequencies hashed straight into a
+    fixed-width sparse vector, with no vocabulary or IDF to build per call
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(
+        analyzer=_pre_analyzed,
+        n_features=2 ** 18,
+        alternate_sign=False,
+        norm="l2",
+    )
+
+
+SKILL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+SKILL_SIMILARITY_THRESHOLD = 0.75
+_SKILL_EMBEDDING_CACHE_SIZE = 10000
+_skill_model = None
+_skill_model_failed = False
+_skill_embeddings: Dict[str, "torch.Tensor"] = {}
+_skill_model_lock = Lock()
+
+
+def _text_digest(text: str) -> bytes:
+    """Return a short, stable digest of the given text"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
 
 
 def compute_semantic_similarity(resume_text: str, job_text: str) -> float:
     """
     Compute semantic similarity (0-100) between resume and job description text.
 
-    Uses TF-IDF (unigrams + bigrams) with English stop words removed.
+    Uses unigrams + bigrams with English stop words removed, weighted by TF-IDF when a
+    background corpus has been fitted and by term frequency otherwise.
+    Very short texts are compared by the Jaccard overlap of their words instead.
     Returns a score in the range [0, 100]. In case of any error, returns 0.
+    Results are cached per (resume, job) pair.
     """
     resume_text = (resume_text or "").strip()
     job_text = (job_text or "").strip()
@@ -22,20 +129,161 @@ def compute_semantic_similarity(resume_text: str, job_text: str) -> float:
     if not resume_text or not job_text:
         return 0.0
 
+    resume_digest = _text_digest(resume_text)
+    job_digest = _text_digest(job_text)
+    key = (resume_digest, job_digest)
+    similarity = _similarity_cache.get(key)
+    if similarity is not None:
+        return similarity
+
     try:
-        vectorizer = TfidfVectorizer(
-            stop_words="english",
-            ngram_range=(1, 2),
-            max_features=5000,
-        )
-        tfidf_matrix = vectorizer.fit_transform([job_text, resume_text])
-
-        # Compute cosine similarity between job description (row 0) and resume (row 1)
-        similarity_matrix: np.ndarray = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-        similarity = float(similarity_matrix[0][0])
-
-        return round(similarity * 100, 2)
+        if _is_short(resume_text) or _is_short(job_text):
+            similarity = _jaccard_similarity(resume_text, job_text)
+        else:
+            similarity = _tfidf_similarity(
+                _analyzed_terms(resume_digest, resume_text),
+                _analyzed_terms(job_digest, job_text)
+            )
     except Exception:
+        similarity = 0.0
+
+    _similarity_cache.put(key, similarity)
+    return similarity
+
+
+def _is_short(text: str) -> bool:
+    """Check whether text has fewer than _SHORT_TEXT_WORDS words (without splitting all of it)"""
+    return len(text.split(maxsplit=_SHORT_TEXT_WORDS - 1)) < _SHORT_TEXT_WORDS
+
+
+def _jaccard_similarity(resume_text: str, job_text: str) -> float:
+    """Return the Jaccard overlap (0-100) of the lowercase word sets of the two texts"""
+    resume_words = set(_WORD_RE.findall(resume_text.lower()))
+    job_words = set(_WORD_RE.findall(job_text.lower()))
+    union = resume_words | job_words
+    if not union:
         return 0.0
+    return round(len(resume_words & job_words) / len(union) * 100, 2)
+
+
+def _analyzed_terms(digest: bytes, text: str) -> List[str]:
+    """Return the TF-IDF terms (unigrams + bigrams, no stop words) of text"""
+    terms = _terms_cache.get(digest)
+    if terms is None:
+        terms = _get_analyzer()(text)
+        _terms_cache.put(digest, terms)
+    return terms
+
+
+def fit_background_vectorizer(documents: Iterable[str], save: bool = True) -> None:
+    """
+    Fit the shared TF-IDF vectorizer on a corpus of resume and job description texts.
+
+    The fitted vectorizer is used for every later similarity score in this process and,
+    if save is True, written to TFIDF_VECTORIZER_PATH for other processes to load.
+    """
+    global _background_vectorizer, _background_vectorizer_loaded
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    analyzer = _get_analyzer()
+    vectorizer = TfidfVectorizer(
+        analyzer=_pre_analyzed,
+        max_features=50000,
+    )
+    vectorizer.fit(analyzer(text) for text in documents if text and text.strip())
+
+    with _background_vectorizer_lock:
+        _background_vectorizer = vectorizer
+        _background_vectorizer_loaded = True
+        # Cached scores were computed with the old weights
+        _similarity_cache.clear()
+
+    if save:
+        joblib.dump(vectorizer, TFIDF_VECTORIZER_PATH)
+
+
+def _get_background_vectorizer():
+    """Return the background TF-IDF vectorizer, loading it once per process (None if not fitted)"""
+    global _background_vectorizer, _background_vectorizer_loaded
+    if _background_vectorizer_loaded:
+        return _background_vectorizer
+    with _background_vectorizer_lock:
+        if not _background_vectorizer_loaded:
+            try:
+                import joblib
+                _background_vectorizer = joblib.load(TFIDF_VECTORIZER_PATH)
+            except Exception:
+                _background_vectorizer = None  # not fitted yet, will fit each pair
+            _background_vectorizer_loaded = True
+    return _background_vectorizer
+
+
+def _tfidf_similarity(resume_terms: List[str], job_terms: List[str]) -> float:
+    """Vectorize the pair of analyzed documents and return their cosine similarity (0-100)"""
+    vectorizer = _get_background_vectorizer() or _get_hasher()
+    matrix = vectorizer.transform([job_terms, resume_terms])
+
+    # Rows are already L2-normalized, so the cosine similarity between job description
+    # (row 0) and resume (row 1) is just their dot product
+    similarity = float(matrix[0].multiply(matrix[1]).sum())
+
+    return round(similarity * 100, 2)
+
+
+def _get_skill_model():
+    """Load the sentence embedding model once per process (None if unavailable)"""
+    global _skill_model, _skill_model_failed
+    if _skill_model_failed:
+        return None
+    with _skill_model_lock:
+        if _skill_model is None and not _skill_model_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _skill_model = SentenceTransformer(SKILL_EMBEDDING_MODEL)
+            except Exception:
+                # sentence-transformers not installed or model not downloaded, will use fallback
+                _skill_model_failed = True
+    return _skill_model
+
+
+def _embed_skills(model, skills: list) -> "torch.Tensor":
+    """Return embeddings for the given skills, encoding only unseen ones in one batch"""
+    import torch
+    with _skill_model_lock:
+        missing = [skill for skill in skills if skill not in _skill_embeddings]
+        if missing:
+            if len(_skill_embeddings) + len(missing) > _SKILL_EMBEDDING_CACHE_SIZE:
+                _skill_embeddings.clear()
+            embeddings = model.encode(missing, batch_size=64, convert_to_tensor=True)
+            _skill_embeddings.update(zip(missing, embeddings))
+        return torch.stack([_skill_embeddings[skill] for skill in skills])
+
+
+def match_skills_semantically(job_skills: Iterable[str], resume_skills: Iterable[str],
+                              threshold: float = SKILL_SIMILARITY_THRESHOLD) -> Set[str]:
+    """
+    Return the job skills whose embedding is close to at least one resume skill.
+
+    All pairs are compared with a single batched cosine-similarity matrix.
+    Returns an empty set when sentence-transformers (or its model) is not available.
+    """
+    job_list = list(job_skills)
+    resume_list = list(resume_skills)
+    if not job_list or not resume_list:
+        return set()
+
+    model = _get_skill_model()
+    if model is None:
+        return set()
+
+    try:
+        from sentence_transformers import util
+        similarity = util.cos_sim(_embed_skills(model, job_list), _embed_skills(model, resume_list))
+        is_match = (similarity.max(dim=1).values >= threshold).tolist()
+    except Exception:
+        return set()
+
+    return {job_skill for job_skill, matched in zip(job_list, is_match) if matched}
 
 
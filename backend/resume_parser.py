@@ -2,29 +2,94 @@
 Resume Parser - Extracts information from resume files
 Supports PDF and DOCX formats
 """
+import functools
 import re
-import pdfplumber
-from docx import Document
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
-# Try to import spacy, but make it optional
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except (ImportError, TypeError, Exception):
-    SPACY_AVAILABLE = False
-    spacy = None
+from skill_matcher import SkillMatcher
+
+# The PDF/DOCX libraries and spaCy are imported on first use, so importing this module
+# (or parsing only DOCX files) doesn't pay for loading all of them
+
+# Precompiled patterns (compiled once at import instead of on every resume)
+# Date ranges, e.g. "2020 - 2024", "Jan 2020 - Present"
+_DATE_RE = re.compile(r'(\d{4}|\w{3}\s+\d{4})\s*[-–—]\s*(\d{4}|\w{3}\s+\d{4}|Present|Current)', re.IGNORECASE)
+_EXP_HEADING_RE = re.compile(r'(experience|employment|work history|professional experience)', re.IGNORECASE)
+# Headings of the sections that usually follow the experience section
+_SECTION_END_RE = re.compile(r'^(?:education|academic background|(?:technical )?skills|projects|certifications)\s*:?$',
+                             re.IGNORECASE)
+_LINE_RE = re.compile(r'[^\n]+')
+# Degree plus up to six whole words of its name on the same line, stopping at a comma or a
+# connector like "from"/"at"/"with" that starts the school or honours (bounded, so long
+# lines can't backtrack)
+_DEGREE_RE = re.compile(r'\b(?:Bachelor|Master|PhD|Doctorate|B\.S\.|B\.A\.|M\.S\.|M\.A\.|Ph\.D\.)[ \t]+(?:(?:of|in)[ \t]+)?\w+'
+                        r'(?:[ \t]+(?!(?:from|at|with)\b)\w+){0,5}',
+                        re.IGNORECASE)
+_EDU_SECTION_RE = re.compile(r'(?:education|academic background)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
+                             re.IGNORECASE | re.MULTILINE)
+_SKILLS_SECTION_RE = re.compile(r'(?:skills?|technical skills?|competencies?)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)',
+                                re.IGNORECASE | re.MULTILINE)
+_SKILL_DELIMS_RE = re.compile(r'[,;|\n/]+')
+_CAP_WORD_RE = re.compile(r'\b[A-Z][a-z]+\b')
+
+
+@functools.lru_cache(maxsize=1)
+def _load_nlp():
+    """Load the spaCy model once per process (None if unavailable)"""
+    try:
+        import spacy
+        # noun_chunks needs the parser plus POS from tagger/attribute_ruler (both fed by
+        # tok2vec), and ents needs ner - only the lemmatizer is unused
+        return spacy.load("en_core_web_sm", disable=["lemmatizer"])
+    except (ImportError, OSError, Exception):
+        return None  # spacy not available or model not found, will use fallback
+
+
+@functools.lru_cache(maxsize=1)
+def _load_pdfium():
+    """Import pypdfium2 (native PDFium text extraction) once (None if not installed)"""
+    try:
+        import pypdfium2
+        return pypdfium2
+    except ImportError:
+        return None  # will use pdfplumber
 
 
 class ResumeParser:
+    # Common technical and professional skills (built once, shared by every parser)
+    _COMMON_SKILLS = (
+        # Programming Languages
+        'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Ruby', 'Go', 'Swift', 'Kotlin',
+        'TypeScript', 'PHP', 'R', 'MATLAB', 'Scala', 'Perl', 'Rust',
+        
+        # Web Technologies
+        'HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Express', 'Django',
+        'Flask', 'Spring', 'ASP.NET', 'jQuery', 'Bootstrap', 'SASS', 'LESS',
+        
+        # Databases
+        'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Oracle', 'SQLite', 'Redis',
+        'Cassandra', 'Elasticsearch', 'DynamoDB',
+        
+        # Cloud & DevOps
+        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'CI/CD',
+        'Git', 'GitHub', 'GitLab', 'Terraform', 'Ansible', 'Chef', 'Puppet',
+        
+        # Data Science & ML
+        'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Keras',
+        'Pandas', 'NumPy', 'Scikit-learn', 'Data Analysis', 'Statistics',
+        'Natural Language Processing', 'Computer Vision',
+        
+        # Tools & Others
+        'Linux', 'Unix', 'Windows', 'Agile', 'Scrum', 'JIRA', 'Confluence',
+        'Project Management', 'Leadership', 'Communication', 'Teamwork',
+        'Problem Solving', 'Analytical Thinking'
+    )
+    
     def __init__(self):
         """Initialize the resume parser"""
-        self.nlp = None
-        if SPACY_AVAILABLE:
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-            except (OSError, Exception):
-                pass  # spacy not available or model not found, will use fallback
+        self.nlp = _load_nlp()
+        
+        self._skill_matcher = SkillMatcher(self._get_common_skills())
     
     def extract_text(self, file_path: str) -> str:
         """Extract text from resume file (PDF or DOCX)"""
@@ -37,43 +102,56 @@ class ResumeParser:
     
     def _extract_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
+        pdfium = _load_pdfium()
+        if pdfium is None:
+            import pdfplumber
+            with pdfplumber.open(file_path) as pdf:
+                return "\n".join(page.extract_text() or "" for page in pdf.pages)
+        
+        pdf = pdfium.PdfDocument(file_path)
+        fallback_pdf = None
+        try:
+            pages = []
+            for index in range(len(pdf)):
+                try:
+                    page = pdf[index]
+                    # PDFium separates lines with \r\n
+                    pages.append(page.get_textpage().get_text_range().replace("\r\n", "\n"))
+                except Exception:
+                    # Fall back to pdfplumber for the pages PDFium can't read
+                    if fallback_pdf is None:
+                        import pdfplumber
+                        fallback_pdf = pdfplumber.open(file_path)
+                    pages.append(fallback_pdf.pages[index].extract_text() or "")
+            return "\n".join(pages)
+        finally:
+            if fallback_pdf is not None:
+                fallback_pdf.close()
+            pdf.close()
     
     def _extract_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file"""
+        from docx import Document
         doc = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs)
     
-    def extract_skills(self, text: str, common_skills: List[str] = None) -> Set[str]:
-        """Extract skills from resume text"""
-        if common_skills is None:
-            common_skills = self._get_common_skills()
-        
-        text_lower = text.lower()
-        found_skills = set()
+    def extract_skills(self, text: str, common_skills: List[str] = None,
+                       text_lower: Optional[str] = None) -> Set[str]:
+        """Extract skills from resume text (text_lower: text.lower(), if already computed)"""
+        skill_matcher = self._skill_matcher if common_skills is None else SkillMatcher(common_skills)
         
-        # Match common skills
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                found_skills.add(skill)
+        # Match common skills (whole words only, in a single pass)
+        found_skills = skill_matcher.find(text, text_lower)
         
         # Extract skills section if present
-        skills_pattern = r'(?:skills?|technical skills?|competencies?)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)'
-        skills_match = re.search(skills_pattern, text, re.IGNORECASE | re.MULTILINE)
+        skills_match = _SKILLS_SECTION_RE.search(text)
         if skills_match:
             skills_text = skills_match.group(1)
-            # Split by common delimiters
-            for delimiter in [',', ';', '|', '\n', '/']:
-                if delimiter in skills_text:
-                    for item in skills_text.split(delimiter):
-                        skill = item.strip()
-                        if len(skill) > 2 and len(skill) < 50:
-                            found_skills.add(skill)
+            # Split by all common delimiters at once
+            for item in _SKILL_DELIMS_RE.split(skills_text):
+                skill = item.strip()
+                if len(skill) > 2 and len(skill) < 50:
+                    found_skills.add(skill)
         
         return found_skills
     
@@ -81,27 +159,31 @@ class ResumeParser:
         """Extract work experience from resume"""
         experience = []
         
-        # Pattern to match date ranges (e.g., "2020 - 2024", "Jan 2020 - Present")
-        date_pattern = r'(\d{4}|\w{3}\s+\d{4})\s*[-–—]\s*(\d{4}|\w{3}\s+\d{4}|Present|Current)'
-        
-        # Split text into lines
-        lines = text.split('\n')
-        
         # Look for experience section
         in_experience_section = False
         current_entry = None
         
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
+        # Walk the lines in place rather than splitting the whole text into a list
+        for line_match in _LINE_RE.finditer(text):
+            line_stripped = line_match.group(0).strip()
+            
+            # Leave the section at the heading of the next one (a later experience
+            # heading starts it again, e.g. after a summary that mentions "experience")
+            if in_experience_section and _SECTION_END_RE.match(line_stripped):
+                if current_entry:
+                    experience.append(current_entry)
+                    current_entry = None
+                in_experience_section = False
+                continue
             
             # Detect experience section
-            if re.search(r'(experience|employment|work history|professional experience)', line_stripped, re.IGNORECASE):
+            if _EXP_HEADING_RE.search(line_stripped):
                 in_experience_section = True
                 continue
             
             if in_experience_section and line_stripped:
                 # Check if line contains date pattern (likely a job entry)
-                date_match = re.search(date_pattern, line_stripped, re.IGNORECASE)
+                date_match = _DATE_RE.search(line_stripped)
                 if date_match:
                     if current_entry:
                         experience.append(current_entry)
@@ -119,17 +201,11 @@ class ResumeParser:
     
     def extract_education(self, text: str) -> List[str]:
         """Extract education information"""
-        education = []
-        
-        # Pattern for degrees
-        degree_pattern = r'\b(?:Bachelor|Master|PhD|Doctorate|B\.S\.|B\.A\.|M\.S\.|M\.A\.|Ph\.D\.)\s+(?:of|in)?\s*\w+'
-        
-        education_matches = re.findall(degree_pattern, text, re.IGNORECASE)
-        education.extend(education_matches)
+        # Match degrees (each distinct degree once, in order of appearance)
+        education = list(dict.fromkeys(match.group(0).strip() for match in _DEGREE_RE.finditer(text)))
         
         # Look for education section
-        education_section_pattern = r'(?:education|academic background)[\s:]*([^•\n]+(?:\n(?!•)[^•\n]+)*)'
-        education_match = re.search(education_section_pattern, text, re.IGNORECASE | re.MULTILINE)
+        education_match = _EDU_SECTION_RE.search(text)
         if education_match:
             education_text = education_match.group(1)
             education.append(education_text.strip())
@@ -140,10 +216,13 @@ class ResumeParser:
         """Extract important keywords from resume"""
         if not self.nlp:
             # Fallback: simple keyword extraction
-            words = re.findall(r'\b[A-Z][a-z]+\b', text)
+            words = _CAP_WORD_RE.findall(text)
             return set(words[:50])  # Return first 50 capitalized words
         
-        doc = self.nlp(text)
+        return self._keywords_from_doc(self.nlp(text))
+    
+    def _keywords_from_doc(self, doc) -> Set[str]:
+        """Extract keywords from a spaCy doc"""
         keywords = set()
         
         # Extract noun phrases and important terms
@@ -161,42 +240,38 @@ class ResumeParser:
     def parse(self, file_path: str) -> Dict:
         """Parse resume and return structured data"""
         text = self.extract_text(file_path)
+        return self._build_result(text, self.extract_keywords(text))
+    
+    def parse_many(self, file_paths: List[str], batch_size: int = 32, n_process: int = 1) -> List[Dict]:
+        """
+        Parse several resumes, running spaCy over all of them in batches
+        (n_process > 1 spreads the batches over that many processes)
+        """
+        texts = [self.extract_text(file_path) for file_path in file_paths]
+        
+        if not self.nlp:
+            return [self._build_result(text, self.extract_keywords(text)) for text in texts]
+        
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        return [self._build_result(text, self._keywords_from_doc(doc)) for text, doc in zip(texts, docs)]
+    
+    def _build_result(self, text: str, keywords: Set[str]) -> Dict:
+        """Assemble the structured resume data from its text and keywords"""
+        # Lowercase the document once and share it with the extractors that need it
+        text_lower = text.lower()
+        skills = self.extract_skills(text, text_lower=text_lower)
         
         return {
             'text': text,
-            'skills': self.extract_skills(text),
+            'skills': skills,
+            'skills_lower': frozenset(s.lower().strip() for s in skills),
             'experience': self.extract_experience(text),
             'education': self.extract_education(text),
-            'keywords': self.extract_keywords(text)
+            'keywords': keywords,
+            'keywords_lower': frozenset(k.lower().strip() for k in keywords)
         }
     
-    def _get_common_skills(self) -> List[str]:
-        """Return list of common technical and professional skills"""
-        return [
-            # Programming Languages
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Ruby', 'Go', 'Swift', 'Kotlin',
-            'TypeScript', 'PHP', 'R', 'MATLAB', 'Scala', 'Perl', 'Rust',
-            
-            # Web Technologies
-            'HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Express', 'Django',
-            'Flask', 'Spring', 'ASP.NET', 'jQuery', 'Bootstrap', 'SASS', 'LESS',
-            
-            # Databases
-            'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Oracle', 'SQLite', 'Redis',
-            'Cassandra', 'Elasticsearch', 'DynamoDB',
-            
-            # Cloud & DevOps
-            'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'CI/CD',
-            'Git', 'GitHub', 'GitLab', 'Terraform', 'Ansible', 'Chef', 'Puppet',
-            
-            # Data Science & ML
-            'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Keras',
-            'Pandas', 'NumPy', 'Scikit-learn', 'Data Analysis', 'Statistics',
-            'Natural Language Processing', 'Computer Vision',
-            
-            # Tools & Others
-            'Linux', 'Unix', 'Windows', 'Agile', 'Scrum', 'JIRA', 'Confluence',
-            'Project Management', 'Leadership', 'Communication', 'Teamwork',
-            'Problem Solving', 'Analytical Thinking'
-        ]
+    def _get_common_skills(self) -> Tuple[str, ...]:
+        """Return common technical and professional skills"""
+        return self._COMMON_SKILLS
 
@@ -0,0 +1,75 @@
+"""
+Skill Matcher - Finds known skills in text in a single pass
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+
+# Try to import pyahocorasick, but make it optional
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+
+# Runs of letters/digits, i.e. the words is_whole_word() checks against
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] is not part of a longer word"""
+    return ((start == 0 or not text[start - 1].isalnum()) and
+            (end == len(text) or not text[end].isalnum()))
+
+
+class SkillMatcher:
+    def __init__(self, skills: Iterable[str]):
+        """Build the matcher once so every document is matched in a single pass"""
+        # Lowercase form -> skill as given
+        self._skills: Dict[str, str] = {skill.lower(): skill for skill in skills}
+        
+        self._automaton = None
+        self._word_skills: FrozenSet[str] = frozenset()
+        self._regex = None
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for skill_lower, skill in self._skills.items():
+                self._automaton.add_word(skill_lower, (len(skill_lower), skill))
+            self._automaton.make_automaton()
+        else:
+            # Fallback: single-word skills ("python", "aws") are looked up in the set of
+            # words in the text; the rest ("machine learning", "c++", "node.js") go through
+            # one case-insensitive alternation regex, longest first so "machine learning"
+            # wins over "learning", with lookarounds so they match whole words only
+            self._word_skills = frozenset(s for s in self._skills if _WORD_RE.fullmatch(s))
+            other_skills = sorted((s for s in self._skills if s not in self._word_skills), key=len, reverse=True)
+            if other_skills:
+                alternatives = '|'.join(map(re.escape, other_skills))
+                self._regex = re.compile(r'(?<![^\W_])(' + alternatives + r')(?![^\W_])', re.IGNORECASE)
+    
+    def find(self, text: str, text_lower: Optional[str] = None) -> Set[str]:
+        """Return the skills occurring as whole words in text, ignoring case
+        (so "scala" doesn't match "scalable"). Pass text_lower if the caller
+        already has text.lower() so it isn't computed again"""
+        found = set()
+        
+        if self._automaton is not None:
+            # The automaton is case-sensitive, so it needs a lowercased copy of the text
+            if text_lower is None:
+                text_lower = text.lower()
+            for end, (length, skill) in self._automaton.iter(text_lower):
+                if is_whole_word(text_lower, end - length + 1, end + 1):
+                    found.add(skill)
+            return found
+        
+        if self._word_skills:
+            words = set(_WORD_RE.findall(text_lower if text_lower is not None else text.lower()))
+            found.update(self._skills[word] for word in self._word_skills & words)
+        
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                skill = self._skills.get(match.group(1).lower())
+                if skill is not None:
+                    found.add(skill)
+        return found
@@ -0,0 +1,26 @@
+"""
+Analysis Worker - Parses and scores resumes inside worker processes
+"""
+from typing import Dict
+
+from resume_parser import ResumeParser
+from job_parser import JobDescriptionParser
+from ats_scorer import ATSScorer
+
+# Created lazily so each worker process loads the parsers (and spaCy model) once
+_resume_parser = None
+_job_parser = None
+_scorer = None
+
+
+def analyze(resume_path: str, job_description: str) -> Dict:
+    """Parse a resume file and job description and return the ATS score results"""
+    global _resume_parser, _job_parser, _scorer
+    if _scorer is None:
+        _resume_parser = ResumeParser()
+        _job_parser = JobDescriptionParser()
+        _scorer = ATSScorer()
+    
+    resume_data = _resume_parser.parse(resume_path)
+    job_data = _job_parser.extract_requirements(job_description)
+    return _scorer.calculate_score(resume_data, job_data)